@@ -6,12 +6,19 @@ from typing import Dict, Optional
 # NORMALIZATION
 # --------------------------------------------------
 
+_PAT_NONWORD = re.compile(r"[^\w\s\-.,]")
+_PAT_WS = re.compile(r"\s+")
+
+
 def normalize_text(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
-    value = value.lower()
-    value = re.sub(r"[^\w\s\-.,]", "", value)  # remove invisible chars
-    value = re.sub(r"\s+", " ", value).strip()
+    return _normalize_already_lower(value.lower())
+
+
+def _normalize_already_lower(value: str) -> str:
+    value = _PAT_NONWORD.sub("", value)  # remove invisible chars
+    value = _PAT_WS.sub(" ", value).strip()
     return value
 
 
@@ -19,31 +26,39 @@ def normalize_text(value: Optional[str]) -> Optional[str]:
 # HEURISTIC PARSER (ROBUST & SAFE)
 # --------------------------------------------------
 
+# One alternation, compiled once at import, so heuristic_parse scans the
+# text a single time. Each named group holds the value returned for its field.
+# The text is lowercased up front, so the pattern is case-sensitive.
+_FIELD_RE = re.compile(
+    r"brand\s*:\s*(?P<brand>[^|]+)"
+    r"|manufacturer\s*:\s*(?P<manufacturer>[^|]+)"
+    r"|country (?:of origin|as labeled)\s*:\s*(?P<origin_country>[^|]+)"
+    r"|usage\s*:\s*(?P<usage>[^|]+)"
+    r"|ingredients\s*:\s*(?P<ingredients>[^|]+)"
+    r"|(?P<expiry>expiry|best before)\s*:\s*[^|]+"
+    r"|(?P<customer_care_contact>toll free|customer care)[^|]*"
+    r"|importer\s*contact\s*information\s*:\s*(?P<importer>[^|]+)"
+    r"|packer\s*contact\s*information\s*:\s*(?P<packer>[^|]+)"
+)
+
+_FIELDS = tuple(_FIELD_RE.groupindex)
+
+
 def heuristic_parse(text: str) -> Dict[str, Optional[str]]:
     text = text.lower()
 
-    def grab(pattern):
-        m = re.search(pattern, text, re.IGNORECASE)
-        if not m:
-            return None
-        for g in m.groups():
-            if g:
-                return normalize_text(g)
-        return None
+    parsed: Dict[str, Optional[str]] = dict.fromkeys(_FIELDS)
+    seen = set()
 
-    parsed = {
-        "brand": grab(r"brand\s*:\s*([^|]+)"),
-        "manufacturer": grab(r"manufacturer\s*:\s*([^|]+)"),
-        "origin_country": grab(
-            r"country of origin\s*:\s*([^|]+)|country as labeled\s*:\s*([^|]+)"
-        ),
-        "usage": grab(r"usage\s*:\s*([^|]+)"),
-        "ingredients": grab(r"ingredients\s*:\s*([^|]+)"),
-        "expiry": grab(r"(expiry|best before)\s*:\s*([^|]+)"),
-        "customer_care_contact": grab(r"(toll free|customer care)[^|]*"),
-        "importer": grab(r"importer\s*contact\s*information\s*:\s*([^|]+)"),
-        "packer": grab(r"packer\s*contact\s*information\s*:\s*([^|]+)"),
-    }
+    # First match per field wins
+    for m in _FIELD_RE.finditer(text):
+        field = m.lastgroup
+        if field is None or field in seen:  # every branch names a group
+            continue
+        seen.add(field)
+        parsed[field] = _normalize_already_lower(m.group(field))
+        if len(seen) == len(_FIELDS):  # nothing left to find
+            break
 
     return parsed
 
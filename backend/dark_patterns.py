@@ -4,6 +4,19 @@ from bs4 import BeautifulSoup
 
 from models import ProductData
 
+DRIP_KEYWORDS = [
+    "convenience fee",
+    "platform fee",
+    "internet handling fee",
+    "handling charges",
+    "processing fee",
+    "service charge",
+]
+
+# Single case-insensitive pass over the page text for all drip keywords
+_DRIP_RE = re.compile("|".join(map(re.escape, DRIP_KEYWORDS)), re.I)
+_UP_TO_RE = re.compile(r"up to\s+(\d+)%\s*off", re.I)
+
 class DarkPatternFinding:
     def __init__(self, code: str, message: str, severity: str = "medium"):
         self.code = code
@@ -27,15 +40,7 @@ def detect_dark_patterns(product: ProductData, html: str) -> List[DarkPatternFin
 
     # ---------- 1) Drip pricing keywords ----------
     # Look for extra fees like "convenience fee", "internet handling fee", etc. [web:63]
-    drip_keywords = [
-        "convenience fee",
-        "platform fee",
-        "internet handling fee",
-        "handling charges",
-        "processing fee",
-        "service charge",
-    ]
-    if any(kw.lower() in full_text.lower() for kw in drip_keywords):
+    if _DRIP_RE.search(full_text):
         findings.append(
             DarkPatternFinding(
                 code="DARK_DRIP_PRICING",
@@ -49,7 +54,7 @@ def detect_dark_patterns(product: ProductData, html: str) -> List[DarkPatternFin
 
     # ---------- 2) Exaggerated 'up to X% off' ----------
     # If text says "up to 80% off" but actual discount is far lower, flag it. [web:61][web:63]
-    up_to_match = re.search(r"up to\s+(\d+)%\s*off", full_text, re.I)
+    up_to_match = _UP_TO_RE.search(full_text)
     if up_to_match and product.price and product.price.mrp and product.price.deal:
         try:
             claimed = int(up_to_match.group(1))
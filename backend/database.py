@@ -1,7 +1,7 @@
 from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from datetime import datetime, timezone
 
 DATABASE_URL = "sqlite:///./scans.db"
 
@@ -15,7 +15,7 @@ class ScanRecord(Base):
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, index=True)
     risk_score = Column(Integer)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     # Storing complex objects as JSON strings for simplicity in this hackathon
     product_data = Column(JSON) 
     violations_data = Column(JSON)
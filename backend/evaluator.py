@@ -1,8 +1,8 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 import re
 
 from rules import RULES
-from models import ProductData
+from models import ProductData, Violation
 from ai_extractor import ai_parse_technical_details
 
 
@@ -43,41 +43,103 @@ FIELD_ALIASES = {
     "price": ["price"],
 }
 
+# Each alias list names a single attribute, so dispatch is a flat lookup
+_FIELD_TO_ATTR = {field: attrs[0] for field, attrs in FIELD_ALIASES.items()}
+
+# Risk-score deduction per severity; the single source for /scan scoring
+SEVERITY_WEIGHTS = {"HIGH": 20, "MEDIUM": 10, "LOW": 5}
+
+
+# --------------------------------------------------
+# RULE BUCKETS (built once at import)
+# --------------------------------------------------
+
+# (rule, fields to check, advisory?)
+_RuleEntry = Tuple[Dict[str, Any], Tuple[str, ...], bool]
+
+
+def _bucket_rules() -> Tuple[List[_RuleEntry], Dict[str, List[_RuleEntry]]]:
+    general: List[_RuleEntry] = []
+    by_category: Dict[str, List[_RuleEntry]] = {}
+
+    for rule in RULES:
+        if rule["id"] in SKIPPED_RULE_IDS:
+            continue
+
+        entry: _RuleEntry = (
+            rule,
+            tuple(
+                f for f in rule.get("required_fields", [])
+                if f not in UNVERIFIABLE_FIELDS
+            ),
+            rule["id"] in ADVISORY_RULE_IDS,
+        )
+
+        category: Optional[str] = rule.get("category", "all")
+        if category in ("all", None):
+            general.append(entry)
+        else:
+            by_category.setdefault(category, []).append(entry)
+
+    return general, by_category
+
+
+# RULES lists the general rules first, so general + category keeps report order
+_ACTIVE_RULES_ALL, _ACTIVE_RULES_BY_CATEGORY = _bucket_rules()
+
+
+def _checked_fields(entries: List[_RuleEntry]) -> FrozenSet[str]:
+    return frozenset(field for _, check_fields, _ in entries for field in check_fields)
+
+
+# Fields the product's rules actually check (skipped rules and
+# UNVERIFIABLE_FIELDS already excluded); indexed once per product
+_CHECKED_FIELDS_ALL = _checked_fields(_ACTIVE_RULES_ALL)
+_CHECKED_FIELDS_BY_CATEGORY = {
+    category: _CHECKED_FIELDS_ALL | _checked_fields(entries)
+    for category, entries in _ACTIVE_RULES_BY_CATEGORY.items()
+}
+
 
 # --------------------------------------------------
 # HELPERS
 # --------------------------------------------------
 
-def _field_exists(product: ProductData, field: str) -> bool:
-    # 🔹 Special case: quantity inferred from title
+_QUANTITY_RE = re.compile(r"\d+\s?(ml|l|g|kg)")
+_COSMETIC_USAGE_RE = re.compile(r"lotion|cream|moistur")
+_COSMETIC_CAT_RE = re.compile(r"lotion|cream|cosmetic|skin")
+
+
+def _field_exists(values: Dict[str, Any], field: str, title: str) -> bool:
+    # 🔹 Special case: quantity inferred from (lowercased) title
     if field == "quantity":
-        title = (product.title or "").lower()
-        return bool(re.search(r"\d+\s?(ml|l|g|kg)", title))
+        return bool(_QUANTITY_RE.search(title))
 
-    for attr in FIELD_ALIASES.get(field, [field]):
-        val = getattr(product, attr, None)
-        if val not in (None, "", [], {}):
-            return True
+    val = values.get(_FIELD_TO_ATTR.get(field, field))
+    return val not in (None, "", [], {})
 
-    return False
 
+def _build_presence_index(
+    product: ProductData, title: str, fields: FrozenSet[str]
+) -> Dict[str, bool]:
+    values = product.__dict__  # plain dict access instead of getattr per field
+    return {field: _field_exists(values, field, title) for field in fields}
 
-def _infer_from_title(product: ProductData) -> None:
-    title = (product.title or "").lower()
 
+def _infer_from_title(product: ProductData, title: str) -> None:
     # Brand inference
     if not product.brand and title:
         product.brand = title.split()[0]
 
     # Usage inference
     if not product.usage:
-        if any(k in title for k in ["lotion", "cream", "moistur"]):
+        if _COSMETIC_USAGE_RE.search(title):
             product.usage = "skin application"
 
 
-def _enrich_product_with_ai(product: ProductData) -> None:
+def _enrich_product_with_ai(product: ProductData, title: str) -> None:
     if not product.technical_details:
-        _infer_from_title(product)
+        _infer_from_title(product, title)
         return
 
     parsed = ai_parse_technical_details(product.technical_details)
@@ -86,7 +148,7 @@ def _enrich_product_with_ai(product: ProductData) -> None:
         if hasattr(product, k) and getattr(product, k) in (None, "", []):
             setattr(product, k, v)
 
-    _infer_from_title(product)
+    _infer_from_title(product, title)
 
 
 # --------------------------------------------------
@@ -94,50 +156,62 @@ def _enrich_product_with_ai(product: ProductData) -> None:
 # --------------------------------------------------
 
 def evaluate_compliance(product: ProductData) -> Dict[str, Any]:
-    _enrich_product_with_ai(product)
-
-    violations: List[Dict[str, Any]] = []
-    risk_score = 100
-
-    for rule in RULES:
+    # Shared by enrichment and quantity checks
+    title = product.title_lower
+
+    _enrich_product_with_ai(product, title)
+
+    category = product.category or ""
+    rules: List[_RuleEntry] = (
+        _ACTIVE_RULES_ALL + _ACTIVE_RULES_BY_CATEGORY.get(category, [])
+    )
+    presence: Dict[str, bool] = _build_presence_index(
+        product, title, _CHECKED_FIELDS_BY_CATEGORY.get(category, _CHECKED_FIELDS_ALL)
+    )
+
+    violations: List[Violation] = []
+    # Scored violations per severity; weights applied once at the end
+    high: int = 0
+    medium: int = 0
+    low: int = 0
+
+    for rule, check_fields, advisory in rules:
         rule_id = rule["id"]
 
-        if rule_id in SKIPPED_RULE_IDS:
-            continue
-
-        rule_category = rule.get("category", "all")
-        if rule_category not in ("all", None, product.category):
-            continue
-
-        missing = []
-        for field in rule.get("required_fields", []):
-            if field in UNVERIFIABLE_FIELDS:
-                continue
-            if not _field_exists(product, field):
-                missing.append(field)
+        missing: List[str] = [field for field in check_fields if not presence[field]]
 
         if not missing:
             continue
 
-        if rule_id in ADVISORY_RULE_IDS:
-            violations.append({
-                "rule_id": rule_id,
-                "severity": "LOW",
-                "description": f"{rule['title']} (advisory)",
-                "suggestion": rule.get("suggestion", ""),
-            })
+        if advisory:
+            violations.append(Violation(
+                rule_id=rule_id,
+                severity="LOW",
+                description=f"{rule['title']} (advisory)",
+                suggestion=rule.get("suggestion", ""),
+            ))
             continue
 
-        violations.append({
-            "rule_id": rule_id,
-            "severity": rule["severity"],
-            "description": f"{rule['title']} – missing: {', '.join(missing)}",
-            "suggestion": rule.get("suggestion", ""),
-        })
-
-        risk_score -= {"HIGH": 20, "MEDIUM": 10, "LOW": 5}.get(
-            rule["severity"], 0
-        )
+        violations.append(Violation(
+            rule_id=rule_id,
+            severity=rule["severity"],
+            description=f"{rule['title']} – missing: {', '.join(missing)}",
+            suggestion=rule.get("suggestion", ""),
+        ))
+
+        severity = rule["severity"]
+        if severity == "HIGH":
+            high += 1
+        elif severity == "MEDIUM":
+            medium += 1
+        elif severity == "LOW":
+            low += 1
+
+    risk_score = 100 - (
+        high * SEVERITY_WEIGHTS["HIGH"]
+        + medium * SEVERITY_WEIGHTS["MEDIUM"]
+        + low * SEVERITY_WEIGHTS["LOW"]
+    )
 
     return {
         "risk_score": max(0, risk_score),
@@ -150,7 +224,7 @@ def evaluate_compliance(product: ProductData) -> Dict[str, Any]:
 # --------------------------------------------------
 
 def infer_product_category(product: ProductData) -> str:
-    text = f"{product.title or ''} {product.usage or ''}".lower()
-    if any(k in text for k in ["lotion", "cream", "cosmetic", "skin"]):
+    text = f"{product.title_lower} {(product.usage or '').lower()}"
+    if _COSMETIC_CAT_RE.search(text):
         return "cosmetics"
     return "general"
@@ -1,16 +1,19 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
+import logging
 
 from models import ScanRequest, ScanResult, ProductData, Violation
-from database import get_db, init_db, ScanRecord
+from database import get_db, init_db, ScanRecord, SessionLocal
 
 # IMPORTANT: evaluator is now the ONLY compliance engine
-from evaluator import evaluate_compliance, infer_product_category
+from evaluator import evaluate_compliance, infer_product_category, SEVERITY_WEIGHTS
 from fastapi.responses import StreamingResponse
 from report_generator import generate_pdf_report
 
+logger = logging.getLogger(__name__)
+
 # -------------------------------------------------
 # App Initialization
 # -------------------------------------------------
@@ -44,6 +47,15 @@ def download_report(result: dict):
             "Content-Disposition": "attachment; filename=safebuy_report.pdf"
         }
     )
+
+
+# -------------------------------------------------
+# Trust weights (violation severities are uppercase;
+# risk weights come from evaluator.SEVERITY_WEIGHTS)
+# -------------------------------------------------
+_TRUST_WEIGHTS = {"HIGH": 5, "MEDIUM": 3}
+
+
 # -------------------------------------------------
 # Trust Index (kept simple & realistic)
 # -------------------------------------------------
@@ -64,7 +76,7 @@ def compute_trust_index(product: ProductData, violations: list[Violation]) -> di
         reasons.append("Country of origin not disclosed.")
 
     for v in violations:
-        score -= {"HIGH": 5, "MEDIUM": 3}.get(v.severity.upper(), 0)
+        score -= _TRUST_WEIGHTS.get(v.severity, 0)
 
     return {
         "score": max(0, min(score, 100)),
@@ -72,6 +84,34 @@ def compute_trust_index(product: ProductData, violations: list[Violation]) -> di
     }
 
 
+# -------------------------------------------------
+# Persistence (runs after the response is sent)
+# -------------------------------------------------
+def _persist_scan(
+    url: str,
+    timestamp: datetime,
+    risk_score: int,
+    product_data: dict,
+    violations_data: list,
+) -> None:
+    db = SessionLocal()
+    try:
+        db.add(ScanRecord(
+            url=url,
+            timestamp=timestamp,
+            risk_score=risk_score,
+            product_data=product_data,
+            violations_data=violations_data,
+        ))
+        db.commit()
+    except Exception:
+        # The client already has its 200, so make the lost record visible
+        db.rollback()
+        logger.exception("Failed to persist scan record for %s", url)
+    finally:
+        db.close()
+
+
 # -------------------------------------------------
 # Routes
 # -------------------------------------------------
@@ -86,32 +126,31 @@ def root():
 
 
 @app.post("/scan", response_model=ScanResult)
-def scan_product(request: ScanRequest, db: Session = Depends(get_db)):
+def scan_product(request: ScanRequest, background: BackgroundTasks):
     # Lazy imports (avoid circular deps)
     from scraper import scrape_product, _fetch_html
     from dark_patterns import detect_dark_patterns
 
     url = request.url
+    now = datetime.now(timezone.utc)  # one clock read per scan
 
-    # 1️⃣ Fetch & scrape
+    # 1️⃣ Fetch once & scrape (html is reused for dark-pattern detection)
     html = _fetch_html(url)
-    product = scrape_product(url)
+    product = scrape_product(url, html)
 
     # 2️⃣ Category inference (lightweight)
     product.category = infer_product_category(product)
 
     # 3️⃣ Compliance evaluation (ONLY evaluator.py)
     compliance_result = evaluate_compliance(product)
-    base_violations = [
-        Violation(**v) for v in compliance_result["violations"]
-    ]
+    base_violations = compliance_result["violations"]
 
     # 4️⃣ Dark pattern detection (separate system)
     dark_findings = detect_dark_patterns(product, html)
     dark_violations = [
         Violation(
             rule_id=f.code,
-            severity=f.severity,
+            severity=f.severity.upper(),
             description=f.message,
             suggestion="Review pricing/UX for potential dark patterns.",
         )
@@ -123,36 +162,34 @@ def scan_product(request: ScanRequest, db: Session = Depends(get_db)):
 
     # 6️⃣ Risk score (single source)
     risk_score = compliance_result["risk_score"]
-    for v in dark_violations:
-        risk_score -= {"HIGH": 20, "MEDIUM": 10, "LOW": 5}.get(v.severity.upper(), 0)
+    if risk_score > 0:  # already at the floor otherwise
+        for v in dark_violations:
+            risk_score -= SEVERITY_WEIGHTS.get(v.severity, 0)
 
-    risk_score = max(0, risk_score)
+        risk_score = max(0, risk_score)
 
     # 7️⃣ Trust index
     trust_index = compute_trust_index(product, all_violations)
 
     # 8️⃣ Build response
     result = ScanResult(
-        timestamp=datetime.utcnow(),
+        timestamp=now,
         product=product,
         risk_score=risk_score,
         violations=all_violations,
         trust_index=trust_index,
     )
 
-    # 9️⃣ Persist to DB
-    record = ScanRecord(
-        url=url,
-        risk_score=result.risk_score,
-        product_data=product.dict(exclude={"timestamp"}),
-        violations_data=[v.dict() for v in result.violations],
+    # 9️⃣ Persist to DB off the request path (result.id stays unset)
+    background.add_task(
+        _persist_scan,
+        url,
+        now,
+        result.risk_score,
+        product.dict(exclude={"timestamp"}),
+        [v.dict() for v in result.violations],
     )
 
-    db.add(record)
-    db.commit()
-    db.refresh(record)
-    result.id = record.id
-
     return result
 
 
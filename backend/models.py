@@ -1,6 +1,7 @@
 from pydantic import BaseModel,  Field
 from typing import List, Optional
 from datetime import datetime
+from functools import cached_property
 
 # Used by Person 2 (Scraper)
 class Price(BaseModel):
@@ -31,6 +32,12 @@ class ProductData(BaseModel):
     importer: Optional[str] = None
     packer: Optional[str] = None
 
+    # Lowercased once per scan and shared by category inference and the
+    # compliance engine; the title is not modified after scraping.
+    @cached_property
+    def title_lower(self) -> str:
+        return (self.title or "").lower()
+
 # Used by Person 3 (Compliance)
 class Violation(BaseModel):
     rule_id: str
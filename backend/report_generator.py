@@ -1,32 +1,60 @@
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
-from datetime import datetime
-from io import BytesIO
+from reportlab.pdfgen.textobject import PDFTextObject
+from datetime import datetime, timezone
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterator
 
-def generate_pdf_report(result: dict) -> BytesIO:
-    buffer = BytesIO()
+PAGE_HEIGHT = A4[1]
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+
+# Small reports stay in memory; larger ones spill to a temp file
+_SPOOL_MAX_SIZE = 64 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_chunks(buffer: IO[bytes]) -> Iterator[bytes]:
+    try:
+        while chunk := buffer.read(_CHUNK_SIZE):
+            yield chunk
+    finally:
+        buffer.close()
+
+
+def _violation_text(c: canvas.Canvas, y: float) -> PDFTextObject:
+    t = c.beginText(60, y)
+    t.setFont(FONT, 10, leading=14)
+    return t
+
+
+def generate_pdf_report(result: dict) -> Iterator[bytes]:
+    """
+    Renders the report and returns an iterator of PDF chunks,
+    suitable for passing straight to StreamingResponse.
+    """
+    buffer = SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
     c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
 
-    y = height - 50
+    y = PAGE_HEIGHT - 50
 
     # Title
-    c.setFont("Helvetica-Bold", 18)
+    c.setFont(FONT_BOLD, 18)
     c.drawString(50, y, "SafeBuy Compliance Report")
     y -= 30
 
-    c.setFont("Helvetica", 11)
-    c.drawString(50, y, f"Generated on: {datetime.utcnow().strftime('%d %b %Y %H:%M UTC')}")
+    c.setFont(FONT, 11)
+    c.drawString(50, y, f"Generated on: {datetime.now(timezone.utc).strftime('%d %b %Y %H:%M UTC')}")
     y -= 40
 
     product = result["product"]
 
     # Product details
-    c.setFont("Helvetica-Bold", 13)
+    c.setFont(FONT_BOLD, 13)
     c.drawString(50, y, "Product Details")
     y -= 20
 
-    c.setFont("Helvetica", 11)
+    c.setFont(FONT, 11)
     c.drawString(50, y, f"Title: {product.get('title')}")
     y -= 15
     c.drawString(50, y, f"Seller: {product.get('seller', 'Unknown')}")
@@ -35,7 +63,7 @@ def generate_pdf_report(result: dict) -> BytesIO:
     y -= 25
 
     # Risk score
-    c.setFont("Helvetica-Bold", 13)
+    c.setFont(FONT_BOLD, 13)
     c.drawString(50, y, f"Risk Score: {result['risk_score']}")
     y -= 25
 
@@ -43,22 +71,25 @@ def generate_pdf_report(result: dict) -> BytesIO:
     c.drawString(50, y, "Violations")
     y -= 20
 
-    c.setFont("Helvetica", 10)
+    c.setFont(FONT, 10)
     violations = result.get("violations", [])
 
     if not violations:
         c.drawString(60, y, "No violations detected.")
     else:
+        # One text object per page instead of a drawString per violation
+        t = _violation_text(c, y)
         for v in violations:
-            if y < 80:
+            if t.getY() < 80:
+                c.drawText(t)
                 c.showPage()
-                y = height - 50
+                t = _violation_text(c, PAGE_HEIGHT - 50)
 
-            c.drawString(60, y, f"- {v['description']} ({v['severity']})")
-            y -= 14
+            t.textLine(f"- {v['description']} ({v['severity']})")
+        c.drawText(t)
 
     c.showPage()
     c.save()
 
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return _iter_chunks(buffer)
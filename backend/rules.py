@@ -1,4 +1,6 @@
-RULES = [
+from typing import Any, Dict, List
+
+RULES: List[Dict[str, Any]] = [
 
 # =====================================================
 # GENERAL E-COMMERCE RULES (17)
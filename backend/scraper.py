@@ -1,6 +1,8 @@
 import time
 import random
 import re
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
 from urllib.parse import urlparse
 
 import requests
@@ -11,10 +13,45 @@ from models import ProductData, Price
 
 ua = UserAgent()
 
-
-def scrape_product(url: str) -> ProductData:
+# Shared across scans so repeat requests to a host reuse the connection.
+# Cookies are refused so one scan's site cookies never ride along on
+# another's request (each fetch already sends a random User-Agent).
+_session = requests.Session()
+_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+# Patterns are compiled once here; the returns/heading ones run per DOM node.
+_RUPEE_PRICE_RE = re.compile(r"₹\s*([\d,]+(?:\.\d+)?)")
+_RETURNS_LABEL_RE = re.compile(r"Returns", re.I)
+_DETAILS_HEADING_RE = re.compile(r"Technical Details|Product Details", re.I)
+
+_PCT_OFF_RE = re.compile(r"\d+% off", re.I)
+_SELLER_LABEL_RE = re.compile(r"Seller", re.I)
+_FLIPKART_RETURNS_RE = re.compile(r"\b\d+\s*day[s]?\s+(Replacement|Returnable)", re.I)
+
+_AMAZON_DISCOUNT_RE = re.compile(r"-?\d+%(\s*off)?", re.I)
+_AMAZON_RETURNS_ID_RE = re.compile(r"RETURNS_POLICY|RETURNS-FEATURE", re.I)
+_AMAZON_RETURNS_RE = re.compile(r"\b\d+\s*-?\s*day[s]?\s+return", re.I)
+_AMAZON_TECH_TABLE_ID_RE = re.compile(
+    r"productDetails_techSpec|productDetails_detailBullets", re.I
+)
+
+_GENERIC_DISCOUNT_RE = re.compile(r"(\d+)%\s*off", re.I)
+_GENERIC_SELLER_LABEL_RE = re.compile(r"Brand|Seller|Sold by", re.I)
+_GENERIC_RETURNS_RE = re.compile(
+    r"\b\d+\s*day[s]?\s+(return|refund|replacement|returnable)", re.I
+)
+_DESCRIPTION_ID_RE = re.compile(r"productDescription|description", re.I)
+_DESCRIPTION_CLASS_RE = re.compile(r"description|prod-desc|product-info", re.I)
+
+
+def scrape_product(url: str, html: Optional[str] = None) -> ProductData:
+    """
+    Scrapes a product page. Pass html if the page was already fetched
+    to avoid a second round trip.
+    """
     domain = urlparse(url).netloc.lower()
-    html = _fetch_html(url)
+    if html is None:
+        html = _fetch_html(url)
 
     if "flipkart.com" in domain:
         return _scrape_flipkart(url, html)
@@ -37,7 +74,7 @@ def _fetch_html(url: str) -> str:
 
     time.sleep(random.uniform(1, 2))
 
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _session.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
     return resp.text
 
@@ -84,8 +121,8 @@ def _scrape_flipkart(url: str, html: str) -> ProductData:
 
     # Discount label like "18% off"
     discount_el = (
-        soup.find("div", string=re.compile(r"\d+% off", re.I))
-        or soup.find("span", string=re.compile(r"\d+% off", re.I))
+        soup.find("div", string=_PCT_OFF_RE)
+        or soup.find("span", string=_PCT_OFF_RE)
     )
     if discount_el:
         discount_text = discount_el.get_text(strip=True)
@@ -98,7 +135,7 @@ def _scrape_flipkart(url: str, html: str) -> ProductData:
     # ---------- SELLER ----------
     seller = "Unknown seller"
     # Look for a block labeled "Seller"
-    seller_label = soup.find("span", string=re.compile(r"Seller", re.I))
+    seller_label = soup.find("span", string=_SELLER_LABEL_RE)
     if seller_label:
         parent = seller_label.find_parent()
         if parent:
@@ -112,7 +149,7 @@ def _scrape_flipkart(url: str, html: str) -> ProductData:
     # Examples: "7 days Replacement", "10 days Returnable"
     for node in soup.select("span, div, li"):
         txt = node.get_text(strip=True)
-        if re.search(r"\b\d+\s*day[s]?\s+(Replacement|Returnable)", txt, re.I):
+        if _FLIPKART_RETURNS_RE.search(txt):
             returns_candidate = txt
             break
     if returns_candidate:
@@ -197,7 +234,7 @@ def _scrape_amazon(url: str, html: str) -> ProductData:
     # Discount:
     # 1) If Amazon shows explicit "18% off", read it.
     discount_text = None
-    explicit_span = soup.find("span", string=re.compile(r"-?\d+%(\s*off)?", re.I))
+    explicit_span = soup.find("span", string=_AMAZON_DISCOUNT_RE)
     if explicit_span:
         discount_text = explicit_span.get_text(strip=True)
 
@@ -216,8 +253,8 @@ def _scrape_amazon(url: str, html: str) -> ProductData:
 
     #returns / refund
     returns_container = soup.find(
-        id=re.compile(r"RETURNS_POLICY|RETURNS-FEATURE", re.I)
-    ) or soup.find("div", string=re.compile(r"Returns", re.I))
+        id=_AMAZON_RETURNS_ID_RE
+    ) or soup.find("div", string=_RETURNS_LABEL_RE)
 
     if returns_container:
         returns_text = returns_container.get_text(separator=" ", strip=True)
@@ -226,7 +263,7 @@ def _scrape_amazon(url: str, html: str) -> ProductData:
         #10 days returnable
         for node in soup.select("span, li, div"):
             txt = node.get_text(strip=True)
-            if re.search(r"\b\d+\s*-?\s*day[s]?\s+return", txt, re.I):
+            if _AMAZON_RETURNS_RE.search(txt):
                 returns = txt[:120]
                 break
     
@@ -235,7 +272,7 @@ def _scrape_amazon(url: str, html: str) -> ProductData:
     # 1)Amazon technical details / product details tables
     tech_table = soup.find(
         "table",
-        id=re.compile(r"productDetails_techSpec|productDetails_detailBullets", re.I)
+        id=_AMAZON_TECH_TABLE_ID_RE
     )
 
     rows = []
@@ -253,7 +290,7 @@ def _scrape_amazon(url: str, html: str) -> ProductData:
         # 2)"Technical Details" / "Product Details"
         heading = soup.find(
             lambda tag: tag.name in ["h1", "h2", "h3", "span"]
-            and re.search(r"Technical Details|Product Details", tag.get_text(), re.I)
+            and _DETAILS_HEADING_RE.search(tag.get_text())
         )
         if heading:
             container = heading.find_parent()
@@ -321,7 +358,7 @@ def _scrape_generic(url: str, html: str) -> ProductData:
     mrp = deal
 
     # Try to capture a second, higher price as MRP (if present)
-    prices = re.findall(r"₹\s*([\d,]+(?:\.\d+)?)", full_text)
+    prices = _RUPEE_PRICE_RE.findall(full_text)
     if len(prices) >= 2:
         nums = [ _safe_float(p.replace(",", "")) for p in prices ]
         nums = [n for n in nums if n is not None]
@@ -331,7 +368,7 @@ def _scrape_generic(url: str, html: str) -> ProductData:
             mrp, deal = high, low
 
     # Discount like "20% OFF" or "51% off" [web:37][web:38]
-    m = re.search(r"(\d+)%\s*off", full_text, re.I)
+    m = _GENERIC_DISCOUNT_RE.search(full_text)
     if m:
         discount_text = f"{m.group(1)}% off"
 
@@ -342,7 +379,7 @@ def _scrape_generic(url: str, html: str) -> ProductData:
 
     # ---------- SELLER ----------
     seller = "Unknown seller"
-    seller_label = soup.find(string=re.compile(r"Brand|Seller|Sold by", re.I))
+    seller_label = soup.find(string=_GENERIC_SELLER_LABEL_RE)
     if seller_label:
         parent = seller_label.find_parent()
         if parent:
@@ -354,7 +391,7 @@ def _scrape_generic(url: str, html: str) -> ProductData:
     returns = None
     for node in soup.select("span, div, li"):
         txt = node.get_text(strip=True)
-        if re.search(r"\b\d+\s*day[s]?\s+(return|refund|replacement|returnable)", txt, re.I):
+        if _GENERIC_RETURNS_RE.search(txt):
             returns = txt[:120]
             break
 
@@ -367,8 +404,8 @@ def _scrape_generic(url: str, html: str) -> ProductData:
 
     if not description:
         desc_div = (
-            soup.find("div", id=re.compile(r"productDescription|description", re.I))
-            or soup.find("div", class_=re.compile(r"description|prod-desc|product-info", re.I))
+            soup.find("div", id=_DESCRIPTION_ID_RE)
+            or soup.find("div", class_=_DESCRIPTION_CLASS_RE)
         )
         if desc_div:
             description = desc_div.get_text(" ", strip=True)
@@ -409,7 +446,7 @@ def _extract_price(text: str):
     """
     Finds first ₹number in text and returns it as float.
     """
-    match = re.search(r"₹\s*([\d,]+(?:\.\d+)?)", text)
+    match = _RUPEE_PRICE_RE.search(text)
     if not match:
         return None
     return _safe_float(match.group(1).replace(",", ""))